@@ -0,0 +1,127 @@
+"""Benchmark parse throughput of the process pool against in-process parsing.
+
+Downloads one finviz screener page and one GuruFocus summary once (or reads
+them from disk), then parses N copies of each with 1..CPU-quota workers and
+prints pages/second and speedup over the in-process baseline. No network
+traffic happens inside the timed section.
+
+That default mode is an upper bound on parse throughput only: every page is
+already in memory and handed over in one `map`. The shipped screener path is
+different — `fetch_view_data` downloads pages one at a time and submits each
+as it arrives, so real gains are capped by download latency. `--screen`
+measures that path: it replays the saved finviz page through
+`fetch_view_data` with `--latency-ms` of simulated download time per page,
+with and without a pool.
+
+Run::
+
+    PYTHONPATH=. python scripts/bench_parse_pool.py --pages 200
+    PYTHONPATH=. python scripts/bench_parse_pool.py --finviz-html page.html --gurufocus-html awi.html
+    PYTHONPATH=. python scripts/bench_parse_pool.py --finviz-html page.html --screen --latency-ms 300
+"""
+import argparse
+import sys
+import time
+
+from src.financial_data import stocks_screener
+from src.hermes_tools import gurufocus
+from src.hermes_tools.parse_pool import ParsePool, cpu_quota
+
+
+def _load(path, fetch):
+    if path:
+        with open(path, "rb") as fh:
+            return fh.read()
+    return fetch()
+
+
+def _worker_counts(quota):
+    counts = []
+    n = 1
+    while n < quota:
+        counts.append(n)
+        n *= 2
+    counts.append(quota)
+    return counts
+
+
+def _bench(label, fn, payloads, counts):
+    start = time.perf_counter()
+    for html in payloads:
+        fn(html)
+    baseline = len(payloads) / (time.perf_counter() - start)
+    print(f"\n{label}: {len(payloads)} pages")
+    print(f"  in-process   {baseline:8.1f} pages/s")
+
+    for workers in counts:
+        pool = ParsePool(workers)
+        pool.warm()
+        try:
+            start = time.perf_counter()
+            pool.map(fn, payloads)
+            rate = len(payloads) / (time.perf_counter() - start)
+        finally:
+            pool.shutdown()
+        print(f"  {workers:3d} workers  {rate:8.1f} pages/s  x{rate / baseline:.2f}")
+
+
+def _bench_screen(html, pages, latency, counts):
+    # Replay the saved page instead of downloading; patched before any pool
+    # is created so forked workers see the same page count.
+    def fake_fetch(view, filters, page, order, *args):
+        time.sleep(latency)
+        return html
+
+    stocks_screener.fetch_page_html = fake_fetch
+    stocks_screener.get_last_page = lambda soup: pages
+
+    def run(pool):
+        start = time.perf_counter()
+        stocks_screener.fetch_view_data(stocks_screener.VIEWS[0], "", "ticker", pool=pool)
+        return pages / (time.perf_counter() - start)
+
+    baseline = run(None)
+    print(f"\nfetch_view_data: {pages} pages, {latency * 1000:.0f} ms simulated latency each")
+    print(f"  in-process   {baseline:8.1f} pages/s")
+    for workers in counts:
+        pool = ParsePool(workers)
+        pool.warm()
+        try:
+            rate = run(pool)
+        finally:
+            pool.shutdown()
+        print(f"  {workers:3d} workers  {rate:8.1f} pages/s  x{rate / baseline:.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200, help="copies of each page to parse")
+    parser.add_argument("--finviz-html", help="saved finviz screener page (skips download)")
+    parser.add_argument("--gurufocus-html", help="saved GuruFocus summary page (skips download)")
+    parser.add_argument("--ticker", default="AWI", help="GuruFocus ticker to download")
+    parser.add_argument("--screen", action="store_true",
+                        help="time fetch_view_data end to end with simulated download latency")
+    parser.add_argument("--latency-ms", type=float, default=300, help="simulated latency per page (--screen)")
+    args = parser.parse_args()
+
+    finviz_html = _load(args.finviz_html, lambda: stocks_screener.fetch_page_html(
+        stocks_screener.VIEWS[0], stocks_screener.FILTERS, 1, stocks_screener.ORDER))
+    quota = cpu_quota()
+    counts = _worker_counts(quota)
+    print(f"cpu quota: {quota}")
+
+    if args.screen:
+        _bench_screen(finviz_html, args.pages, args.latency_ms / 1000, counts)
+        return 0
+
+    guru_html = _load(args.gurufocus_html, lambda: gurufocus._fetch(args.ticker))
+
+    _bench("finviz parse_screener_page", stocks_screener.parse_screener_page,
+           [finviz_html] * args.pages, counts)
+    _bench("gurufocus parse_summary", gurufocus.parse_summary,
+           [guru_html] * args.pages, counts)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,14 +29,19 @@ def normalize_column_names(df):
     return df
 
 
+def create_session(max_requests=2):
+    return CachedLimiterSession(
+        limiter=Limiter(RequestRate(max_requests, Duration.SECOND * 5)),  # max N requests per 5 seconds
+        bucket_class=MemoryQueueBucket,
+        backend=SQLiteCache("yfinance.cache"),
+    )
+
+
 class YahooData:
-    def __init__(self, ticker=None):
+    def __init__(self, ticker=None, session=None):
         self.ticker = ticker
-        self.session = CachedLimiterSession(
-            limiter=Limiter(RequestRate(2, Duration.SECOND * 5)),  # max 2 requests per 5 seconds
-            bucket_class=MemoryQueueBucket,
-            backend=SQLiteCache("yfinance.cache"),
-        )
+        # Pass a session to make several instances share one rate limit and cache connection
+        self.session = session or create_session()
         self.ticker_data = yf.Ticker(ticker, session=self.session) if ticker else None
 
     def adjust_api_result(self, api_result, last_date_only):
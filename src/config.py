@@ -2,6 +2,15 @@ import os
 
 FRED_API_KEY = os.environ.get('FRED_API_KEY')
 
+# Process-pool HTML parsing: unset/0 = in-process, 'auto' = CPU quota, N = N workers
+PARSE_POOL_WORKERS = os.environ.get('PARSE_POOL_WORKERS')
+
+# Full-universe finviz snapshot: unset = every screen is a live scrape
+FINVIZ_SNAPSHOT_PATH = os.environ.get('FINVIZ_SNAPSHOT_PATH')
+FINVIZ_SNAPSHOT_REFRESH_HOURS = float(os.environ.get('FINVIZ_SNAPSHOT_REFRESH_HOURS', 24))
+# In-process snapshot refresher, SSE mode only; stdio deployments refresh via cron
+FINVIZ_SNAPSHOT_REFRESHER = os.environ.get('FINVIZ_SNAPSHOT_REFRESHER', '').lower() in ('1', 'true', 'yes')
+
 FINANCIAL_DATA_SCREENER_FILTERS = 'cap_microover,fa_debteq_u1,fa_roa_pos'
 FINANCIAL_DATA_SCREENER_ORDER = '-roa'
 
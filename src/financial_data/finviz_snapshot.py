@@ -0,0 +1,425 @@
+"""Full-universe finviz snapshot and a local query engine over it.
+
+Most screens are just different filter combinations over the same US
+universe, so instead of scraping every screen separately we scrape the whole
+universe once (all `VIEWS`, no filters) into a parquet file and answer
+finviz filter strings such as ``cap_microover,fa_debteq_u1,fa_roa_pos``
+with vectorised pandas predicates over it.
+
+The snapshot stores the merged frame exactly as scraped (display strings
+like ``2.95B`` or ``12.5%``), so query results look the same as a live
+scrape. Numeric versions of the columns a predicate needs are parsed once per
+loaded snapshot and cached.
+
+Filter codes or orders the engine does not understand raise
+`UnsupportedQuery`; callers fall back to a live scrape.
+
+Refresh once (e.g. from cron)::
+
+    PYTHONPATH=. python -m src.financial_data.finviz_snapshot /data/finviz_snapshot.parquet
+
+A refresh holds an ``flock`` on ``<path>.lock`` so concurrent refreshers (cron,
+an SSE server) never scrape at the same time, paces its requests, and
+checkpoints each finished view so a failure resumes instead of restarting
+the whole universe. Files are published with an atomic rename.
+"""
+import contextlib
+import fcntl
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.financial_data import stocks_screener
+
+_logger = logging.getLogger(__name__)
+
+# Market-cap buckets in dollars, as defined on finviz's screener.
+CAP_RANGES = {
+    'mega': (200e9, None),
+    'large': (10e9, 200e9),
+    'mid': (2e9, 10e9),
+    'small': (300e6, 2e9),
+    'micro': (50e6, 300e6),
+    'nano': (None, 50e6),
+    'largeover': (10e9, None),
+    'midover': (2e9, None),
+    'smallover': (300e6, None),
+    'microover': (50e6, None),
+    'largeunder': (None, 200e9),
+    'midunder': (None, 10e9),
+    'smallunder': (None, 2e9),
+    'microunder': (None, 300e6),
+}
+
+# finviz filter prefix -> snapshot column candidates (first present wins).
+NUMERIC_FILTERS = {
+    'fa_pe': ('p/e',),
+    'fa_fpe': ('fwd_p/e',),
+    'fa_peg': ('peg',),
+    'fa_ps': ('p/s',),
+    'fa_pb': ('p/b',),
+    'fa_pc': ('p/c',),
+    'fa_pfcf': ('p/fcf',),
+    'fa_epsyoy': ('eps_this_y',),
+    'fa_epsyoy1': ('eps_next_y',),
+    'fa_eps5years': ('eps_past_5y',),
+    'fa_estltgrowth': ('eps_next_5y',),
+    'fa_sales5years': ('sales_past_5y',),
+    'fa_div': ('dividend', 'div'),
+    'fa_roa': ('roa',),
+    'fa_roe': ('roe',),
+    'fa_roi': ('roi', 'roic'),
+    'fa_curratio': ('curr_r',),
+    'fa_quickratio': ('quick_r',),
+    'fa_ltdebteq': ('ltdebt/eq',),
+    'fa_debteq': ('debt/eq',),
+    'fa_grossmargin': ('gross_m',),
+    'fa_opermargin': ('oper_m',),
+    'fa_netmargin': ('profit_m',),
+    'sh_insiderown': ('insider_own',),
+    'sh_insidertrans': ('insider_trans',),
+    'sh_instown': ('inst_own',),
+    'sh_insttrans': ('inst_trans',),
+    'sh_short': ('short_float', 'float_short'),
+    'sh_price': ('price',),
+    'sh_avgvol': ('avg_volume',),
+    'sh_curvol': ('volume',),
+    'sh_float': ('float',),
+    'sh_outstanding': ('outstanding',),
+}
+
+# finviz expresses these thresholds in thousands / millions of shares.
+NUMERIC_FILTER_SCALE = {
+    'sh_avgvol': 1e3,
+    'sh_curvol': 1e3,
+    'sh_float': 1e6,
+    'sh_outstanding': 1e6,
+}
+
+CATEGORICAL_FILTERS = {
+    'sec': 'sector',
+    'ind': 'industry',
+    'geo': 'country',
+}
+
+# finviz order code -> snapshot column candidates.
+ORDER_COLUMNS = {
+    'marketcap': ('market_cap',),
+    'pe': ('p/e',),
+    'forwardpe': ('fwd_p/e',),
+    'peg': ('peg',),
+    'ps': ('p/s',),
+    'pb': ('p/b',),
+    'pc': ('p/c',),
+    'pfcf': ('p/fcf',),
+    'roa': ('roa',),
+    'roe': ('roe',),
+    'roi': ('roi', 'roic'),
+    'curratio': ('curr_r',),
+    'quickratio': ('quick_r',),
+    'ltdebteq': ('ltdebt/eq',),
+    'debteq': ('debt/eq',),
+    'grossmargin': ('gross_m',),
+    'opermargin': ('oper_m',),
+    'netmargin': ('profit_m',),
+    'dividendyield': ('dividend', 'div'),
+    'insiderown': ('insider_own',),
+    'insidertrans': ('insider_trans',),
+    'instown': ('inst_own',),
+    'insttrans': ('inst_trans',),
+    'shortinterestshare': ('short_float', 'float_short'),
+    'price': ('price',),
+    'change': ('change',),
+    'volume': ('volume',),
+    'averagevolume': ('avg_volume',),
+}
+TEXT_ORDER_COLUMNS = ('company', 'sector', 'industry', 'country')
+
+_NUM = r'-?\d+(?:\.\d+)?'
+_NUMERIC_VALUE_RE = re.compile(
+    rf'^(?:(?P<sign>pos|neg|profitable)|o(?P<over>{_NUM})|u(?P<under>{_NUM})'
+    rf'|(?P<lo>{_NUM})?to(?P<hi>{_NUM})?)$'
+)
+_NUMBER_RE = rf'^({_NUM})([KMBT]?)%?$'
+_SUFFIX = {'': 1.0, 'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+# Floor for the background refresh interval; a full scrape is ~1,700 requests.
+MIN_REFRESH_HOURS = 1
+# Pacing for the full-universe scrape.
+REQUEST_DELAY = 1.0
+REQUEST_RETRIES = 4
+# Finished views younger than this are reused by the next refresh attempt.
+CHECKPOINT_MAX_AGE_HOURS = 6
+
+_cache_lock = threading.Lock()
+_cache = {}
+
+
+class UnsupportedQuery(ValueError):
+    """Raised when a filter string or order can't be answered from a snapshot."""
+
+    def __init__(self, codes):
+        self.codes = list(codes)
+        super().__init__(f"unsupported finviz codes: {', '.join(self.codes)}")
+
+
+def to_number(series):
+    """Parse finviz display strings (``12.5%``, ``2.95B``, ``-``) to floats."""
+    if series.dtype != 'object':
+        return pd.to_numeric(series, errors='coerce').astype(float)
+    s = series.astype(str).str.strip().str.replace(',', '', regex=False)
+    parts = s.str.extract(_NUMBER_RE)
+    value = pd.to_numeric(parts[0], errors='coerce')
+    return value * parts[1].map(_SUFFIX).fillna(1.0)
+
+
+def _normalize(text):
+    return re.sub(r'[^a-z0-9]', '', str(text).lower())
+
+
+class Snapshot:
+    def __init__(self, df, taken_at):
+        self.df = df
+        self.taken_at = taken_at
+        self._numeric = {}
+        self._normalized = {}
+
+    def _column(self, candidates):
+        for col in candidates:
+            if col in self.df.columns:
+                return col
+        return None
+
+    def numeric(self, col):
+        if col not in self._numeric:
+            self._numeric[col] = to_number(self.df[col]).to_numpy()
+        return self._numeric[col]
+
+    def normalized(self, col):
+        if col not in self._normalized:
+            self._normalized[col] = self.df[col].map(_normalize).to_numpy()
+        return self._normalized[col]
+
+    def _predicate(self, code):
+        prefix, _, value = code.rpartition('_')
+
+        if prefix == 'cap' and value in CAP_RANGES:
+            col = self._column(('market_cap',))
+            if col is None:
+                return None
+            lo, hi = CAP_RANGES[value]
+            return _between(self.numeric(col), lo, hi, inclusive_lo=True)
+
+        if prefix in CATEGORICAL_FILTERS:
+            col = CATEGORICAL_FILTERS[prefix]
+            if col not in self.df.columns:
+                return None
+            normalized = self.normalized(col)
+            if prefix == 'ind' and value == 'stocksonly':
+                return normalized != 'exchangetradedfund'
+            if prefix == 'geo' and value == 'notusa':
+                return normalized != 'usa'
+            # Region codes (geo_europe, ...) and ind_ slugs that differ from the
+            # display name match no value here; leave those to a live scrape.
+            parts = value.split('|')
+            if not set(parts) <= set(normalized):
+                return None
+            return np.isin(normalized, parts)
+
+        if prefix in NUMERIC_FILTERS:
+            col = self._column(NUMERIC_FILTERS[prefix])
+            match = _NUMERIC_VALUE_RE.match(value)
+            if col is None or not match:
+                return None
+            values = self.numeric(col)
+            scale = NUMERIC_FILTER_SCALE.get(prefix, 1.0)
+            if match['sign'] in ('pos', 'profitable'):
+                return values > 0
+            if match['sign'] == 'neg':
+                return values < 0
+            if match['over'] is not None:
+                return values > float(match['over']) * scale
+            if match['under'] is not None:
+                return values < float(match['under']) * scale
+            if match['lo'] is None and match['hi'] is None:
+                return None
+            lo = float(match['lo']) * scale if match['lo'] is not None else None
+            hi = float(match['hi']) * scale if match['hi'] is not None else None
+            return _between(values, lo, hi, inclusive_lo=True, inclusive_hi=True)
+
+        return None
+
+    def _sort(self, mask, order):
+        df = self.df[mask]
+        descending = order.startswith('-')
+        code = order.lstrip('-')
+        if code == 'ticker':
+            return df.sort_index(ascending=not descending)
+        if code in TEXT_ORDER_COLUMNS and code in df.columns:
+            return df.sort_values(code, ascending=not descending, na_position='last')
+        col = self._column(ORDER_COLUMNS.get(code, ()))
+        if col is None:
+            raise UnsupportedQuery([f'o={order}'])
+        key = self.numeric(col)[mask]
+        # NaNs sort last either way.
+        return df.iloc[np.argsort(-key if descending else key, kind='stable')]
+
+    def query(self, filters, order='-roa'):
+        """Return the snapshot rows matching a finviz filter string, ordered.
+
+        Raises `UnsupportedQuery` listing every code it can't translate.
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        unsupported = []
+        for code in filter(None, (c.strip() for c in filters.split(','))):
+            predicate = self._predicate(code)
+            if predicate is None:
+                unsupported.append(code)
+            else:
+                mask &= predicate
+        if unsupported:
+            raise UnsupportedQuery(unsupported)
+        return self._sort(mask, order or 'ticker')
+
+    def rows(self, tickers):
+        """Return the snapshot rows for explicit tickers (missing ones skipped)."""
+        index = [t.lower() for t in tickers]
+        return self.df.loc[self.df.index.intersection(index)]
+
+
+def _between(values, lo, hi, inclusive_lo=False, inclusive_hi=False):
+    mask = np.ones(len(values), dtype=bool)
+    if lo is not None:
+        mask &= values >= lo if inclusive_lo else values > lo
+    if hi is not None:
+        mask &= values <= hi if inclusive_hi else values < hi
+    return mask
+
+
+def _write_parquet(df, path):
+    # Parquet needs one type per column; keep the scraped display strings.
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == 'object':
+            df[col] = df[col].map(lambda v: None if pd.isna(v) else str(v))
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _checkpoint_path(path, view):
+    return f'{path}.view{view}'
+
+
+def _scrape_view(path, view, pool):
+    checkpoint = _checkpoint_path(path, view)
+    try:
+        if time.time() - os.path.getmtime(checkpoint) < CHECKPOINT_MAX_AGE_HOURS * 3600:
+            df = pd.read_parquet(checkpoint)
+            _logger.info("finviz snapshot: reusing checkpoint for view %s", view)
+            return df
+    except Exception:
+        pass
+    df = stocks_screener.fetch_view_data(view, '', 'ticker', pool=pool, strict=True,
+                                         delay=REQUEST_DELAY, retries=REQUEST_RETRIES)
+    _write_parquet(df, checkpoint)
+    return df
+
+
+def refresh_snapshot(path, pool=None):
+    """Scrape the whole finviz universe across all `VIEWS` and write it to `path`.
+
+    The scrape is strict: an error response that survives the retries or a
+    short page raises, and the previous snapshot at `path` is left in place.
+    Returns the ticker count, or ``None`` if another process is already
+    refreshing `path`.
+    """
+    started = time.monotonic()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f'{path}.lock', 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            _logger.info("finviz snapshot: %s is being refreshed by another process", path)
+            return None
+
+        frames = [_scrape_view(path, view, pool) for view in stocks_screener.VIEWS]
+        df = stocks_screener.merge_dataframes(frames)
+        _write_parquet(df, path)
+        for view in stocks_screener.VIEWS:
+            with contextlib.suppress(OSError):
+                os.unlink(_checkpoint_path(path, view))
+
+    _logger.info("finviz snapshot: %d tickers written to %s in %.0fs",
+                 len(df), path, time.monotonic() - started)
+    return len(df)
+
+
+def load_snapshot(path):
+    """Return the snapshot at `path`, re-reading it only when the file changes.
+
+    An unreadable file yields the last good snapshot, or ``None``.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is None or cached.taken_at != mtime:
+            try:
+                cached = Snapshot(pd.read_parquet(path), mtime)
+            except Exception:
+                _logger.exception("finviz snapshot: cannot read %s", path)
+                return cached
+            _cache[path] = cached
+        return cached
+
+
+def start_refresher(path, interval_hours, pool=None):
+    """Keep the snapshot at `path` no older than `interval_hours` in a daemon thread."""
+    if interval_hours < MIN_REFRESH_HOURS:
+        raise ValueError(
+            f"finviz snapshot refresh interval must be at least {MIN_REFRESH_HOURS}h, got {interval_hours}"
+        )
+    interval = interval_hours * 3600
+
+    def loop():
+        while True:
+            try:
+                age = time.time() - os.path.getmtime(path)
+            except OSError:
+                age = None
+            if age is None or age >= interval:
+                try:
+                    if refresh_snapshot(path, pool=pool) is not None:
+                        continue
+                except Exception:
+                    _logger.exception("finviz snapshot refresh failed")
+                # Failed (finished views are checkpointed) or another process is on it.
+                time.sleep(min(interval, 600))
+                continue
+            time.sleep(interval - age)
+
+    thread = threading.Thread(target=loop, name='finviz-snapshot', daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    refresh_snapshot(sys.argv[1] if len(sys.argv) > 1 else 'finviz_snapshot.parquet')
@@ -1,3 +1,5 @@
+import logging
+import time
 from io import StringIO
 import numpy as np
 import pandas as pd
@@ -6,6 +8,12 @@ from bs4 import BeautifulSoup
 
 URL_BASE_FINVIZ = 'https://finviz.com/screener.ashx?v={view}&f={filters}&r={page}&o={order}'
 HEADERS = {'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+ROWS_PER_PAGE = 20
+REQUEST_TIMEOUT = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF = 5  # seconds, doubled on every retry
+
+_logger = logging.getLogger(__name__)
 
 # Constants for the filters
 VIEWS = [111, 121, 161, 131]
@@ -21,6 +29,8 @@ RANKED_COLS = {
 
 
 def adjust_columns(df):
+    if df.empty:
+        return pd.DataFrame(index=pd.Index([], name='ticker'))
     df.columns = df.columns.str.lower()
     df = df.loc[:, ~df.columns.duplicated()]
     df.columns = [x.replace(" ", "_") for x in df.columns]
@@ -36,14 +46,42 @@ def get_last_page(soup):
         if last_page_text.isdigit():
             return int(last_page_text)
         else:
-            print(f"Unexpected page text: '{last_page_text}'")
+            _logger.warning("Unexpected page text: '%s'", last_page_text)
             return 1
     return 1
 
 
-def fetch_page_data(view, filters, page, order):
+def fetch_page_html(view, filters, page, order, tickers=None, delay=0.0, retries=0):
+    """Download one screener page.
+
+    Sleeps `delay` seconds before the request, and retries up to `retries`
+    times with exponential backoff on 429/5xx and connection errors.
+    """
     url = URL_BASE_FINVIZ.format(view=view, filters=filters, page=page, order=order)
-    web_screen = re.get(url, headers=HEADERS).text
+    if tickers:
+        url += '&t=' + ','.join(tickers)
+    if delay:
+        time.sleep(delay)
+    for attempt in range(retries + 1):
+        backoff = RETRY_BACKOFF * 2 ** attempt
+        try:
+            response = re.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+        except (re.ConnectionError, re.Timeout):
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                response.raise_for_status()
+                return response.content
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                backoff = max(backoff, int(retry_after))
+        _logger.warning("finviz page %s of view %s failed, retrying in %ss", page, view, backoff)
+        time.sleep(backoff)
+
+
+def fetch_page_data(view, filters, page, order, tickers=None, delay=0.0, retries=0):
+    web_screen = fetch_page_html(view, filters, page, order, tickers, delay, retries)
     soup_screen = BeautifulSoup(web_screen, 'html.parser')
     return soup_screen
 
@@ -53,29 +91,85 @@ def extract_table(soup_screen):
     if table:
         tables = pd.read_html(StringIO(str(table)))
         for df in tables:
-            if df.shape[0] > 1:  # Check if the table has more than one row
+            # Pick the results table by its header; a one-ticker screen has one row
+            if 'ticker' in (str(c).strip().lower() for c in df.columns):
                 return df
     return pd.DataFrame()
 
 
-def fetch_view_data(view, filters, order):
-    web = re.get(URL_BASE_FINVIZ.format(view=view, filters=filters, page=0, order=order), headers=HEADERS).text
-    soup = BeautifulSoup(web, 'html.parser')
+def parse_screener_page(html):
+    """Parse one raw screener page into a compact, picklable result.
+
+    Runs inside parse-pool workers, so it takes raw bytes and returns plain
+    lists instead of a soup or DataFrame.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    df = extract_table(soup)
+    return {
+        'last_page': get_last_page(soup),
+        'columns': [str(c) for c in df.columns],
+        'data': df.values.tolist(),
+    }
+
+
+class IncompleteScrape(RuntimeError):
+    """Raised by a strict scrape when a page came back short or empty."""
+
+
+def fetch_view_data(view, filters, order, pool=None, tickers=None, strict=False, delay=0.0, retries=0):
+    """Scrape every page of one screener view.
+
+    With a `ParsePool` the pages are still downloaded one after another, but
+    each page is handed to a worker process as soon as it arrives so parsing
+    overlaps the next download instead of serialising behind it. `tickers`
+    restricts the screen to an explicit ticker list (finviz `t=` parameter).
+    With `strict`, raise `IncompleteScrape` unless every page but the last
+    returned a full `ROWS_PER_PAGE` rows and the last returned at least one.
+    `delay` and `retries` are passed to `fetch_page_html` for every page.
+    """
+    if pool is None:
+        web = fetch_page_html(view, filters, 0, order, tickers, delay, retries)
+        soup = BeautifulSoup(web, 'html.parser')
+        last_page = get_last_page(soup)
+    else:
+        html = fetch_page_html(view, filters, 0, order, tickers, delay, retries)
+        first = pool.submit(parse_screener_page, html)
+        last_page = first.result()['last_page']
 
-    last_page = get_last_page(soup)
     df_result = pd.DataFrame()
+    pending = []
+    row_counts = []
     page = 1
 
-    while page <= last_page * 20:
-        soup_screen = fetch_page_data(view, filters, page, order)
-        df = extract_table(soup_screen)
-        if not df.empty:
-            df_result = pd.concat([df_result, df], ignore_index=True)
+    while page <= last_page * ROWS_PER_PAGE:
+        if pool is None:
+            soup_screen = fetch_page_data(view, filters, page, order, tickers, delay, retries)
+            df = extract_table(soup_screen)
+            row_counts.append(len(df))
+            if not df.empty:
+                df_result = pd.concat([df_result, df], ignore_index=True)
+        else:
+            html = fetch_page_html(view, filters, page, order, tickers, delay, retries)
+            pending.append(pool.submit(parse_screener_page, html))
 
-        page += 20
-        progress = int((page / (last_page * 20)) * 100)
+        page += ROWS_PER_PAGE
+        progress = int((page / (last_page * ROWS_PER_PAGE)) * 100)
         if progress % 20 == 0:
-            print(f"{progress} %")
+            _logger.info("view %s: %d %%", view, progress)
+
+    if pending:
+        parsed = [f.result() for f in pending]
+        row_counts = [len(r['data']) for r in parsed]
+        frames = [pd.DataFrame(r['data'], columns=r['columns']).infer_objects() for r in parsed if r['data']]
+        if frames:
+            df_result = pd.concat(frames, ignore_index=True)
+
+    if strict:
+        short = [i + 1 for i, n in enumerate(row_counts[:-1]) if n != ROWS_PER_PAGE]
+        if short or not row_counts or row_counts[-1] == 0:
+            raise IncompleteScrape(
+                f"view {view}: {len(row_counts)} pages, short/empty pages {short or [len(row_counts)]}"
+            )
 
     df_result = adjust_columns(df_result)
     return df_result
@@ -131,6 +225,7 @@ def preprocess_dataframe(df):
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     dfs = [fetch_view_data(view, FILTERS, ORDER) for view in VIEWS]
     final_df = merge_dataframes(dfs)
     final_df = preprocess_dataframe(final_df)
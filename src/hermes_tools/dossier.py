@@ -0,0 +1,256 @@
+"""One-call research dossier for a handful of tickers.
+
+Fans out to every source concurrently instead of making the agent chain
+`gurufocus_summary` -> `finviz_screener` -> ... round trips:
+
+* finviz — one `t=` screen for all tickers (not one screen per ticker)
+* GuruFocus summary — one request per ticker
+* Yahoo info + latest balance sheet / income statement / cash flow — one
+  `YahooData` per ticker, all sharing one process-wide rate-limited, cached
+  session sized for the fan-out
+* valuation fallbacks from `stocks_financial_data`, computed from the Yahoo
+  data already fetched, so they cost no extra requests
+
+Each source is trimmed to an allow-list of fields it is the best source for,
+so a field like price or P/E appears once, not three times. Each source is
+timed and may fail on its own; a failure is reported under `errors` and the
+rest of the dossier is still returned.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Callable
+
+import pandas as pd
+
+from src.api_adapters.yahoo import YahooData, create_session
+from src.financial_data import stocks_financial_data
+from src.hermes_tools.finviz import _clean, fetch_finviz_rows
+from src.hermes_tools.gurufocus import fetch_gurufocus_summary
+
+MAX_WORKERS = 16
+
+# Shared by every dossier call in the process. Each ticker costs 4 Yahoo
+# requests (info + 3 statements), so the repo's default 2 per 5s would
+# serialise the fan-out.
+YAHOO_MAX_REQUESTS_PER_5S = 10
+
+# Per-source allow-lists. Fields are taken from one source only: quotes,
+# multiples and profile from finviz, balance-sheet depth from Yahoo, quality
+# scores and fair-value ratios from GuruFocus.
+FINVIZ_FIELDS = (
+    "company", "sector", "industry", "country", "market_cap", "price", "change",
+    "p/e", "fwd_p/e", "peg", "p/s", "p/b", "p/fcf",
+    "eps_this_y", "eps_next_y", "eps_next_5y", "sales_past_5y",
+    "roa", "roe", "roi", "roic", "debt/eq", "gross_m", "oper_m", "profit_m", "dividend",
+    "insider_own", "insider_trans", "inst_own", "short_float", "avg_volume",
+)
+YAHOO_INFO_FIELDS = (
+    "enterprise_value", "trailing_eps", "forward_eps", "book_value", "earnings_growth",
+    "revenue_growth", "total_cash", "total_debt", "free_cashflow", "operating_cashflow",
+    "beta", "fifty_two_week_high", "fifty_two_week_low", "target_mean_price",
+    "recommendation_key", "full_time_employees",
+)
+YAHOO_STATEMENT_FIELDS = {
+    "balance_sheet": (
+        "date", "total_assets", "stockholders_equity", "total_debt", "working_capital",
+        "net_tangible_assets", "cash_and_cash_equivalents",
+    ),
+    "financials": (
+        "date", "total_revenue", "gross_profit", "operating_income", "ebit", "ebitda",
+        "net_income", "diluted_eps",
+    ),
+    "cash_flow": (
+        "date", "operating_cash_flow", "capital_expenditure", "free_cash_flow",
+        "repurchase_of_capital_stock", "cash_dividends_paid",
+    ),
+}
+GURUFOCUS_FIELDS = (
+    "gf_score", "moat_score", "financial_strength", "profitability_rank", "growth_rank",
+    "gf_value_rank", "momentum_rank", "predictability_rank",
+    "piotroski_f_score", "altman_z_score", "beneish_m_score", "wacc",
+    "price_to_gf_value", "price_to_graham_number", "price_to_peter_lynch_fair_value",
+)
+
+_yahoo_session = None
+_yahoo_session_lock = threading.Lock()
+
+
+def build_ticker_dossier(tickers: list[str]) -> dict[str, Any]:
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    if not symbols:
+        raise ValueError("Provide at least one ticker")
+
+    started = time.perf_counter()
+    yahoo_session = _shared_yahoo_session()
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, 1 + 2 * len(symbols))) as executor:
+        finviz = executor.submit(_timed, fetch_finviz_rows, symbols)
+        guru = {s: executor.submit(_timed, fetch_gurufocus_summary, s) for s in symbols}
+        yahoo = {s: executor.submit(_timed, _fetch_yahoo, s, yahoo_session) for s in symbols}
+
+        finviz_result, finviz_ms, finviz_err = finviz.result()
+        finviz_rows, finviz_taken_at = finviz_result or (None, None)
+        guru_results = {s: f.result() for s, f in guru.items()}
+        yahoo_results = {s: f.result() for s, f in yahoo.items()}
+
+    valuation, valuation_ms, valuation_err = _timed(
+        _valuation, {s: r[0] for s, r in yahoo_results.items() if r[0] is not None}
+    )
+
+    dossiers: dict[str, dict[str, Any]] = {}
+    for s in symbols:
+        guru_data, guru_ms, guru_err = guru_results[s]
+        yahoo_data, yahoo_ms, yahoo_err = yahoo_results[s]
+        errors = {
+            name: err
+            for name, err in (
+                ("finviz", finviz_err), ("gurufocus", guru_err),
+                ("yahoo", yahoo_err), ("valuation", valuation_err),
+            )
+            if err
+        }
+        if finviz_rows is not None and s not in finviz_rows:
+            errors["finviz"] = {"error": "not_found", "detail": f"{s} not in finviz screen"}
+
+        dossiers[s] = {
+            "finviz": _finviz_entry((finviz_rows or {}).get(s), finviz_taken_at),
+            "gurufocus": _trim(guru_data["metrics"], GURUFOCUS_FIELDS) if guru_data else None,
+            "yahoo": _yahoo_payload(yahoo_data) if yahoo_data else None,
+            "valuation": (valuation or {}).get(s),
+            "timing_ms": {
+                "finviz": finviz_ms,
+                "gurufocus": guru_ms,
+                "yahoo": yahoo_ms,
+                "valuation": valuation_ms,
+            },
+            "errors": errors,
+        }
+
+    return {
+        "tickers": symbols,
+        "elapsed_ms": _ms_since(started),
+        "dossiers": dossiers,
+    }
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> tuple[Any, float, dict[str, str] | None]:
+    started = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception as exc:
+        return None, _ms_since(started), {"error": type(exc).__name__, "detail": str(exc)}
+    return result, _ms_since(started), None
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _shared_yahoo_session() -> Any:
+    global _yahoo_session
+    with _yahoo_session_lock:
+        if _yahoo_session is None:
+            _yahoo_session = create_session(YAHOO_MAX_REQUESTS_PER_5S)
+        return _yahoo_session
+
+
+def _trim(data: dict[str, Any] | None, fields: tuple[str, ...]) -> dict[str, Any] | None:
+    if data is None:
+        return None
+    return {k: data[k] for k in fields if data.get(k) is not None}
+
+
+def _finviz_entry(row: dict[str, Any] | None, snapshot_taken_at: str | None) -> dict[str, Any] | None:
+    entry = _trim(row, FINVIZ_FIELDS)
+    if entry is not None and snapshot_taken_at:
+        entry["snapshot_taken_at"] = snapshot_taken_at
+    return entry
+
+
+def _fetch_yahoo(ticker: str, session: Any) -> dict[str, Any]:
+    yd = YahooData(ticker, session=session)
+    info_df, stats_df = yd.fetch_info_table()
+    return {
+        "info": info_df,
+        "stats": stats_df,
+        "balance_sheet": yd.fetch_balance_sheet(last_date_only=True),
+        "financials": yd.fetch_financials(last_date_only=True),
+        "cash_flow": yd.fetch_cash_flow(last_date_only=True),
+    }
+
+
+def _yahoo_payload(data: dict[str, Any]) -> dict[str, Any]:
+    info = {**_first_row(data["info"]), **_first_row(data["stats"])}
+    return {
+        "info": _trim(info, YAHOO_INFO_FIELDS),
+        **{
+            key: _trim(_first_row(data[key]), fields)
+            for key, fields in YAHOO_STATEMENT_FIELDS.items()
+        },
+    }
+
+
+def _first_row(df: pd.DataFrame) -> dict[str, Any]:
+    if df.empty:
+        return {}
+    out = {}
+    for k, v in df.iloc[0].items():
+        if k == "ticker":
+            continue
+        if isinstance(v, (list, dict)):
+            out[k] = v
+            continue
+        if pd.isna(v):
+            continue
+        if isinstance(v, (datetime, date)):
+            v = v.strftime("%Y-%m-%d")
+        out[k] = _clean(v)
+    return out
+
+
+def _valuation(yahoo: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Graham number, Lynch value and magic-formula inputs from Yahoo data.
+
+    Magic-formula ranks only mean something against other tickers, so they
+    are added only for 2+ tickers and under `dossier_relative_ranks`, since
+    they rank the dossier's tickers against each other, not the market.
+    """
+    if not yahoo:
+        return {}
+    needed = set(stocks_financial_data.REQUIRED_COLUMNS_GRAHAM
+                 + stocks_financial_data.REQUIRED_COLUMNS_LYNCH
+                 + stocks_financial_data.REQUIRED_COLUMNS_MAGIC) - {"ticker"}
+    rows = []
+    for s, data in yahoo.items():
+        merged: dict[str, Any] = {}
+        for key in ("info", "stats", "balance_sheet", "financials"):
+            for k, v in _first_row(data[key]).items():
+                merged.setdefault(k, v)
+        rows.append({"ticker": s, **{c: merged.get(c) for c in needed}})
+    df = pd.DataFrame(rows)
+    numeric = [c for c in needed if c != "sector_key"]
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+
+    out: dict[str, dict[str, Any]] = {s: {} for s in yahoo}
+    calcs = (
+        (stocks_financial_data.calculate_graham_number,
+         ["graham_number", "current_price_graham_comparison"]),
+        (stocks_financial_data.calculate_peter_lynch_value,
+         ["peter_lynch_value", "current_price_lynch_comparison"]),
+        (stocks_financial_data.calculate_magic_formula,
+         ["earnings_yield", "return_on_capital"]),
+    )
+    for calc, cols in calcs:
+        result = calc(df)
+        for _, row in result.iterrows():
+            out[row["ticker"]].update({c: _clean(row[c]) for c in cols})
+            if calc is stocks_financial_data.calculate_magic_formula and len(result) >= 2:
+                out[row["ticker"]]["dossier_relative_ranks"] = {
+                    "magic_formula_total_rank": _clean(row["total_rank"]),
+                    "magic_formula_sector_rank": _clean(row["total_sector_rank"]),
+                    "ranked_among": len(result),
+                }
+    return out
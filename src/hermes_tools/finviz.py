@@ -3,16 +3,31 @@
 Accepts either a finviz screener URL (the kind you paste from the browser) or
 an explicit (filters, order) pair. Returns a list of row dicts keyed by
 ticker so an LLM tool consumer doesn't need to handle pandas.
+
+When `FINVIZ_SNAPSHOT_PATH` points at a full-universe snapshot (see
+`src.financial_data.finviz_snapshot`), screens are answered locally from it
+and only fall back to a live scrape for filter codes the engine can't
+translate.
 """
 from __future__ import annotations
 
+import logging
+import time
+from datetime import datetime, timezone
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 import numpy as np
 import pandas as pd
 
-from src.financial_data import stocks_screener
+from src.config import FINVIZ_SNAPSHOT_PATH, FINVIZ_SNAPSHOT_REFRESH_HOURS
+from src.financial_data import finviz_snapshot, stocks_screener
+from src.hermes_tools.parse_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# A snapshot older than this many refresh intervals is ignored (refreshes are failing).
+SNAPSHOT_MAX_AGE_INTERVALS = 2
 
 
 def _parse_url(url: str) -> tuple[str, str]:
@@ -38,27 +53,88 @@ def run_finviz_screener(
     if not filters:
         raise ValueError("Provide a finviz URL or a filters string")
 
-    frames = [
-        stocks_screener.fetch_view_data(view, filters, order)
-        for view in stocks_screener.VIEWS
-    ]
-    merged = stocks_screener.merge_dataframes(frames)
-    merged = _coerce_numeric(merged)
-    if limit:
-        merged = merged.head(limit)
-
-    rows = [
-        {"ticker": idx, **{k: _clean(v) for k, v in row.items()}}
-        for idx, row in merged.iterrows()
-    ]
+    meta: dict[str, Any] = {}
+    snapshot = _snapshot()
+    if snapshot is not None:
+        try:
+            merged = snapshot.query(filters, order)
+            if limit:
+                merged = merged.head(limit)
+            merged = _coerce_numeric(merged)
+            meta = {"source": "snapshot", "snapshot_taken_at": _isoformat(snapshot.taken_at)}
+        except finviz_snapshot.UnsupportedQuery as exc:
+            meta = {"unsupported": exc.codes}
+
+    if "source" not in meta:
+        pool = get_pool()
+        frames = [
+            stocks_screener.fetch_view_data(view, filters, order, pool=pool)
+            for view in stocks_screener.VIEWS
+        ]
+        merged = stocks_screener.merge_dataframes(frames)
+        merged = _coerce_numeric(merged)
+        if limit:
+            merged = merged.head(limit)
+        meta = {"source": "live", **meta}
+
+    rows = _rows(merged)
     return {
         "filters": filters,
         "order": order,
+        **meta,
         "count": len(rows),
         "rows": rows,
     }
 
 
+def fetch_finviz_rows(tickers: list[str]) -> tuple[dict[str, dict[str, Any]], str | None]:
+    """Fetch the merged finviz row for each ticker in one screen.
+
+    All tickers go into a single `t=` screen per view, so N tickers cost the
+    same number of finviz requests as one, and none at all when every
+    ticker is in the snapshot. Rows are keyed by upper-case ticker; the
+    second item is the snapshot timestamp, or ``None`` for a live scrape.
+    """
+    snapshot = _snapshot()
+    if snapshot is not None:
+        found = snapshot.rows(tickers)
+        if len(found) == len(set(t.lower() for t in tickers)):
+            rows = {row["ticker"]: row for row in _rows(_coerce_numeric(found), upper=True)}
+            return rows, _isoformat(snapshot.taken_at)
+
+    pool = get_pool()
+    frames = [
+        stocks_screener.fetch_view_data(view, "", "ticker", pool=pool, tickers=tickers)
+        for view in stocks_screener.VIEWS
+    ]
+    merged = _coerce_numeric(stocks_screener.merge_dataframes(frames))
+    return {row["ticker"]: row for row in _rows(merged, upper=True)}, None
+
+
+def _snapshot() -> finviz_snapshot.Snapshot | None:
+    if not FINVIZ_SNAPSHOT_PATH:
+        return None
+    snapshot = finviz_snapshot.load_snapshot(FINVIZ_SNAPSHOT_PATH)
+    if snapshot is None:
+        return None
+    max_age = SNAPSHOT_MAX_AGE_INTERVALS * FINVIZ_SNAPSHOT_REFRESH_HOURS * 3600
+    if time.time() - snapshot.taken_at > max_age:
+        logger.warning("finviz snapshot from %s is stale; scraping live", _isoformat(snapshot.taken_at))
+        return None
+    return snapshot
+
+
+def _isoformat(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def _rows(df: pd.DataFrame, upper: bool = False) -> list[dict[str, Any]]:
+    return [
+        {"ticker": idx.upper() if upper else idx, **{k: _clean(v) for k, v in row.items()}}
+        for idx, row in df.iterrows()
+    ]
+
+
 def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
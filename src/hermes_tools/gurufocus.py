@@ -14,6 +14,8 @@ from typing import Any
 from bs4 import BeautifulSoup
 from curl_cffi import requests
 
+from src.hermes_tools.parse_pool import get_pool
+
 SUMMARY_URL = "https://www.gurufocus.com/stock/{ticker}/summary"
 DEFAULT_TIMEOUT = 30
 IMPERSONATE = "chrome"
@@ -25,14 +27,14 @@ class GuruFocusBlocked(RuntimeError):
     """Raised when GuruFocus returns a Cloudflare challenge / 403."""
 
 
-def _fetch(ticker: str) -> str:
+def _fetch(ticker: str) -> bytes:
     url = SUMMARY_URL.format(ticker=ticker.upper())
     r = requests.get(url, impersonate=IMPERSONATE, timeout=DEFAULT_TIMEOUT)
     if r.status_code != 200:
         raise GuruFocusBlocked(f"{url} -> {r.status_code}")
     if "Just a moment..." in r.text or "cf-browser-verification" in r.text:
         raise GuruFocusBlocked(f"{url} -> Cloudflare challenge")
-    return r.text
+    return r.content
 
 
 def _to_snake(label: str) -> str:
@@ -55,7 +57,7 @@ def _coerce(value: str) -> Any:
     return v
 
 
-def parse_summary(html: str) -> dict[str, Any]:
+def parse_summary(html: str | bytes) -> dict[str, Any]:
     soup = BeautifulSoup(html, "lxml")
     metrics: dict[str, Any] = {}
     for td in soup.select("td.semi-bold"):
@@ -73,7 +75,8 @@ def parse_summary(html: str) -> dict[str, Any]:
 
 def fetch_gurufocus_summary(ticker: str) -> dict[str, Any]:
     html = _fetch(ticker)
-    metrics = parse_summary(html)
+    pool = get_pool()
+    metrics = pool.submit(parse_summary, html).result() if pool else parse_summary(html)
     return {
         "ticker": ticker.upper(),
         "source_url": SUMMARY_URL.format(ticker=ticker.upper()),
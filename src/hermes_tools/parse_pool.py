@@ -0,0 +1,188 @@
+"""Optional process pool for CPU-bound HTML parsing.
+
+BeautifulSoup holds the GIL, so a long finviz screen or a GuruFocus batch is
+capped at one core no matter how the downloads are scheduled. The pool ships
+raw HTML bytes to worker processes and gets compact, picklable results back
+(plain lists/dicts, never soups).
+
+Disabled by default. Enable with ``PARSE_POOL_WORKERS`` (``auto`` sizes the
+pool to the container's CPU quota) or ``--parse-workers`` on the server.
+Workers are spawned and warmed — bs4/lxml/pandas imported, one tiny document
+parsed — at startup so the first tool call doesn't pay for it. If a worker
+dies (OOM, parser crash) the executor is rebuilt and the affected job is
+parsed in-process, so one bad page doesn't break every later call.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable
+
+_logger = logging.getLogger(__name__)
+
+_WARMUP_HTML = b"<html><body><table id='screener-table'><tr><td>x</td></tr></table></body></html>"
+
+_pool: ParsePool | None = None
+
+
+def cpu_quota() -> int:
+    """Number of CPUs this process may actually use.
+
+    Honours the cgroup v2 / v1 CPU quota (what ``docker run --cpus`` sets)
+    and the scheduler affinity mask, falling back to ``os.cpu_count()``.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_quota()
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return max(1, cpus)
+
+
+def _cgroup_quota() -> int | None:
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()[:2]
+        if quota != "max":
+            return math.ceil(int(quota) / int(period))
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as fh:
+            quota_us = int(fh.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as fh:
+            period_us = int(fh.read())
+        if quota_us > 0 and period_us > 0:
+            return math.ceil(quota_us / period_us)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _warm_worker() -> None:
+    # Pay the import + parser-construction cost once per worker.
+    from src.financial_data import stocks_screener
+    from src.hermes_tools import gurufocus
+
+    stocks_screener.parse_screener_page(_WARMUP_HTML)
+    gurufocus.parse_summary(_WARMUP_HTML)
+
+
+def _ping(_: int) -> int:
+    return os.getpid()
+
+
+class PoolFuture:
+    """Future whose `result()` survives the pool breaking underneath it."""
+
+    def __init__(self, pool: ParsePool, executor: ProcessPoolExecutor, future: Any,
+                 fn: Callable[..., Any], args: tuple[Any, ...]):
+        self._pool = pool
+        self._executor = executor
+        self._future = future
+        self._fn = fn
+        self._args = args
+
+    def result(self, timeout: float | None = None) -> Any:
+        try:
+            return self._future.result(timeout)
+        except BrokenProcessPool:
+            self._pool._recover(self._executor)
+            return self._fn(*self._args)
+
+
+class ParsePool:
+    """Thin wrapper around a warmed ``ProcessPoolExecutor``."""
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or cpu_quota()
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+
+    def _recover(self, broken: ProcessPoolExecutor) -> None:
+        # Several futures of the same broken executor may report at once;
+        # only the first one replaces it.
+        with self._lock:
+            if self._executor is not broken:
+                return
+            _logger.warning("parse pool broken (worker died); restarting %d workers", self.workers)
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+        try:
+            self.warm()
+        except BrokenProcessPool:
+            _logger.exception("parse pool failed to restart; the next call will retry")
+
+    def warm(self) -> None:
+        # The executor spawns lazily; push enough trivial jobs to bring every
+        # worker up (and through its initializer) before real work arrives.
+        pids = set(self._executor.map(_ping, range(self.workers * 4)))
+        _logger.info("parse pool ready: %d workers (%d warmed)", self.workers, len(pids))
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> PoolFuture:
+        executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._recover(executor)
+            executor = self._executor
+            future = executor.submit(fn, *args)
+        return PoolFuture(self, executor, future, fn, args)
+
+    def map(self, fn: Callable[..., Any], payloads: Iterable[Any]) -> list[Any]:
+        payloads = list(payloads)
+        executor = self._executor
+        try:
+            return list(executor.map(fn, payloads))
+        except BrokenProcessPool:
+            self._recover(executor)
+            return [fn(p) for p in payloads]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_workers_from_env(value: str | None) -> int | None:
+    """Translate a ``PARSE_POOL_WORKERS`` value into a worker count.
+
+    Empty / ``0`` disables the pool, ``auto`` means "size to CPU quota".
+    """
+    if not value:
+        return None
+    if value.strip().lower() == "auto":
+        return cpu_quota()
+    workers = int(value)
+    return workers if workers > 0 else None
+
+
+def start_pool(workers: int) -> ParsePool:
+    """Create, warm and register the process-wide parse pool."""
+    global _pool
+    if _pool is not None:
+        return _pool
+    _pool = ParsePool(workers)
+    _pool.warm()
+    return _pool
+
+
+def get_pool() -> ParsePool | None:
+    """Return the shared pool, or ``None`` when parsing runs in-process."""
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -15,11 +15,21 @@ from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
+from src.config import (
+    FINVIZ_SNAPSHOT_PATH,
+    FINVIZ_SNAPSHOT_REFRESH_HOURS,
+    FINVIZ_SNAPSHOT_REFRESHER,
+    PARSE_POOL_WORKERS,
+)
+from src.financial_data.finviz_snapshot import start_refresher
+from src.hermes_tools.dossier import build_ticker_dossier
 from src.hermes_tools.finviz import run_finviz_screener
 from src.hermes_tools.fred_macro import fetch_fred_macro
 from src.hermes_tools.gurufocus import GuruFocusBlocked, fetch_gurufocus_summary
+from src.hermes_tools.parse_pool import get_pool, parse_workers_from_env, shutdown_pool, start_pool
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+logger = logging.getLogger(__name__)
 
 mcp = FastMCP("hermes-stock-research")
 
@@ -31,7 +41,11 @@ mcp = FastMCP("hermes-stock-research")
         "views. Provide either `url` (paste a finviz screener URL from the "
         "browser, e.g. https://finviz.com/screener?v=351&f=fa_roa_pos,...&o=-roa) "
         "or an explicit `filters` string (comma-separated finviz filter codes). "
-        "`order` defaults to '-roa'. `limit` caps the number of rows returned."
+        "`order` defaults to '-roa'. `limit` caps the number of rows returned. "
+        "When a full-universe snapshot is configured the screen is answered "
+        "locally (`source: snapshot`, with `snapshot_taken_at`); filter codes "
+        "it can't translate fall back to a live scrape (`source: live`, listed "
+        "under `unsupported`)."
     )
 )
 def finviz_screener(
@@ -60,6 +74,23 @@ def gurufocus_summary(ticker: str) -> dict[str, Any]:
         return {"ticker": ticker.upper(), "error": "blocked", "detail": str(exc)}
 
 
+@mcp.tool(
+    description=(
+        "Research one or more tickers in a single call. For each ticker, fetches "
+        "concurrently: the merged Finviz screener row, the GuruFocus summary "
+        "metrics, Yahoo Finance info plus the latest balance sheet, income "
+        "statement and cash flow, and Graham number / Peter Lynch value / "
+        "magic-formula fallbacks computed from the Yahoo data. Each source is "
+        "trimmed to the key fields it is best for (no duplicates across sources), "
+        "timed (`timing_ms`), and may fail independently; failures are listed "
+        "under `errors` while the remaining sources are still returned. Prefer "
+        "this over chaining gurufocus_summary and finviz_screener per ticker."
+    )
+)
+def ticker_dossier(tickers: list[str]) -> dict[str, Any]:
+    return build_ticker_dossier(tickers)
+
+
 @mcp.tool(
     description=(
         "Fetch FRED macro indicators (defaults: M2 money supply, University of "
@@ -83,8 +114,28 @@ def main() -> None:
         default="stdio",
         help="Transport for the MCP connection (default: stdio)",
     )
+    parser.add_argument(
+        "--parse-workers",
+        default=PARSE_POOL_WORKERS,
+        help="Parse HTML in a process pool: 'auto' (CPU quota) or a worker count; "
+             "unset/0 parses in-process (default: $PARSE_POOL_WORKERS)",
+    )
     args = parser.parse_args()
-    mcp.run(transport=args.transport)
+    workers = parse_workers_from_env(args.parse_workers)
+    if workers:
+        start_pool(workers)
+    if FINVIZ_SNAPSHOT_PATH and FINVIZ_SNAPSHOT_REFRESHER:
+        # stdio servers are one short-lived process per Hermes session; a
+        # universe scrape there would be repeated and cut short every session.
+        if args.transport == "sse":
+            start_refresher(FINVIZ_SNAPSHOT_PATH, FINVIZ_SNAPSHOT_REFRESH_HOURS, pool=get_pool())
+        else:
+            logger.warning("FINVIZ_SNAPSHOT_REFRESHER is ignored in stdio mode; "
+                           "refresh the snapshot with `python -m src.financial_data.finviz_snapshot`")
+    try:
+        mcp.run(transport=args.transport)
+    finally:
+        shutdown_pool()
 
 
 if __name__ == "__main__":